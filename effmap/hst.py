@@ -1,10 +1,234 @@
 import os
-import requests
+import functools
+import tempfile
+import warnings
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
-import lxml.html as lh
-import plotly.graph_objects as go
-from sklearn.linear_model import LinearRegression
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+PA_PER_BAR = 1e5
+
+_image_exporter = ThreadPoolExecutor(max_workers=1)
+
+
+def _compute_eff_core(speed_pump, pressure_discharge, pressure_charge,
+                      leak_coef, mu_dyn, displ, swash, oil_bulk, A, Bp, Bm, Cp,
+                      Cm, D):
+    """Computes the HST efficiencies and performance on flat arrays of operating points.
+
+    The function takes primitive arguments only, so that it can be compiled with Numba when available, and is evaluated with NumPy otherwise. See `HST.compute_eff` for the meaning of the arguments, `leak_coef` is the total leakage per unit sum of the discharge and charge pressures in cub.m/s/Pa and `mu_dyn` is the dynamic viscosity in mPa s.
+
+    Returns
+    -------
+    out: tuple
+        The tuple of ndarrays (vol_pump, vol_motor, vol_hst, mech_pump, mech_motor, mech_hst, total_pump, total_motor, total_hst, torque_pump, torque_motor, power_pump, power_motor, speed_motor).
+    """
+    dp = pressure_discharge - pressure_charge
+    dp_Pa = dp * PA_PER_BAR
+    sum_Pa = (pressure_discharge + pressure_charge) * PA_PER_BAR
+    swash_dp = swash * dp
+    leak_total = leak_coef * sum_Pa
+    th_flow_rate_pump = speed_pump * displ / 6e7
+    vol_pump = (1 - dp / oil_bulk - leak_total / th_flow_rate_pump) * 100
+    vol_motor = (1 - leak_total / th_flow_rate_pump) * 100
+    vol_hst = vol_pump * vol_motor * 1e-2
+    mech_pump = (1 - A * np.exp(-Bp * mu_dyn * speed_pump / swash_dp) -
+                 Cp * np.sqrt(mu_dyn * speed_pump / swash_dp) -
+                 D / swash_dp) * 100
+    mech_motor = (
+        1 - A * np.exp(-Bm * mu_dyn * speed_pump * vol_hst * 1e-2 / swash_dp) -
+        Cm * np.sqrt(mu_dyn * speed_pump * vol_hst * 1e-2 / swash_dp) -
+        D / swash_dp) * 100
+    mech_hst = mech_pump * mech_motor * 1e-2
+    total_pump = vol_pump * mech_pump * 1e-2
+    total_motor = vol_motor * mech_motor * 1e-2
+    total_hst = total_pump * total_motor * 1e-2
+    torque_pump = dp_Pa * displ * 1e-6 / (2 * np.pi * mech_pump * 1e-2)
+    torque_motor = torque_pump * mech_hst * 1e-2
+    power_pump = torque_pump * speed_pump * np.pi / 30 * 1e-3
+    power_motor = power_pump * total_hst * 1e-2
+    speed_motor = speed_pump * vol_hst * 1e-2
+    return (vol_pump, vol_motor, vol_hst, mech_pump, mech_motor, mech_hst,
+            total_pump, total_motor, total_hst, torque_pump, torque_motor,
+            power_pump, power_motor, speed_motor)
+
+
+if njit is None:
+    _compute_eff_kernel = _compute_eff_core
+else:
+    _compute_eff_kernel = njit(parallel=True,
+                               fastmath={'contract', 'arcp', 'reassoc'},
+                               cache=True)(_compute_eff_core)
+
+
+@functools.lru_cache(maxsize=None)
+def _fetch_oil(name):
+    """Loads the oil data from the local cache in ~/.cache/effmap/oils, downloading it from GitHub repository into the cache on first use.
+
+    Parameters
+    ----------
+    name: str
+        The oil name, e.g. 'SAE 15W40'.
+
+    Returns
+    -------
+    oil_data: DataFrame
+        The oil viscosity and density table indexed by temperature. The same object is returned for repeated calls, so it must not be modified.
+    """
+    cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'effmap',
+                             'oils')
+    path = os.path.join(cache_dir, f'{name}.csv')
+    if not os.path.exists(path):
+        import requests
+        response = requests.get(
+            f'https://raw.githubusercontent.com/ivanokhotnikov/effmap/master/oils/{quote(name)}.csv'
+        )
+        response.raise_for_status()
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix='.csv', dir=cache_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(response.content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    return pd.read_csv(path, index_col=0)
+
+
+_ENGINES = {
+    'engine_1': {
+        'speed':
+        np.array([
+            1000, 1100, 1200, 1300, 1400, 1500, 1600, 1700, 1800, 1900, 2000,
+            2100, 2200, 2300, 2400, 2500, 2600, 2700, 2800, 2900, 3000
+        ]),
+        'torque':
+        np.array([
+            1350, 1450, 1550, 1650, 1800, 1975, 2200, 2450, 2750, 3100, 3100,
+            3100, 3100, 3022, 2944, 2849, 2757, 2654, 2200, 1800, 0
+        ]),
+        'power':
+        np.array([
+            141.372, 167.028, 194.779, 224.624, 263.894, 310.232, 368.614,
+            436.158, 518.363, 616.799, 649.262, 681.726, 714.189, 727.865,
+            739.908, 745.866, 750.652, 750.401, 645.074, 546.637, 0
+        ]),
+        'pivot speed':
+        2700
+    },
+    'engine_2': {
+        'speed':
+        np.array([
+            600, 700, 800, 900, 1000, 1100, 1200, 1300, 1400, 1500, 1600, 1700,
+            1800, 1900, 2000, 2100, 2200, 2300, 2400
+        ]),
+        'torque':
+        np.array([
+            1000, 1100, 1450, 1750, 2100, 2400, 2600, 2950, 3100, 3300, 3400,
+            3500, 3400, 3300, 3200, 3000, 2800, 2600, 0
+        ]),
+        'power':
+        np.array([
+            62.8319, 80.634, 121.475, 164.934, 219.911, 276.46, 326.726, 401.6,
+            454.484, 518.363, 569.675, 623.083, 640.885, 656.593, 670.206,
+            659.734, 645.074, 626.224, 0
+        ]),
+        'pivot speed':
+        2200
+    },
+    'engine_3': {
+        'speed':
+        np.array([
+            1800, 1900, 2000, 2100, 2200, 2300, 2400, 2500, 2600, 2700, 2800,
+            2900, 3000, 3100, 3200
+        ]),
+        'torque':
+        np.array([
+            4270, 4458, 4558, 4439, 4350, 4250, 4144, 4033, 3891, 3703, 3459,
+            3183, 2817, 871
+        ]),
+        'power':
+        np.array([
+            805, 887, 955, 994, 1023, 1048, 1068, 1085, 1098, 1100, 1086, 1050,
+            1000, 914, 292
+        ]),
+        'pivot speed':
+        2700
+    },
+    'engine_4': {
+        'speed':
+        np.array([
+            1000, 1100, 1200, 1300, 1400, 1500, 1600, 1700, 1800, 1900, 2000,
+            2100, 2200, 2300, 2400, 2500, 2600, 2700, 2800, 2900, 3000
+        ]),
+        'torque':
+        np.array([
+            1750, 1850, 2000, 2200, 2500, 2850, 3250, 3675, 4125, 4600, 4600,
+            4600, 4600, 4460, 4320, 4180, 4040, 3890, 3300, 2700, 0
+        ]),
+        'power':
+        np.array([
+            183, 213, 251, 299, 366, 448, 544, 654, 777, 915, 963, 1011, 1059,
+            1074, 1085, 1094, 1099, 1099, 967, 820, 0
+        ]),
+        'pivot speed':
+        2700
+    }
+}
+
+
+def _decimate(x, y, n_out):
+    """Downsamples a curve to `n_out` points with the largest-triangle-three-buckets algorithm, keeping the first and the last points.
+
+    Parameters
+    ----------
+    x, y: ndarray
+        The curve coordinates.
+    n_out: int
+        The number of points to keep. Curves with fewer points are returned unchanged.
+
+    Returns
+    -------
+    x, y: ndarray
+        The decimated curve coordinates.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    if n_out >= len(x) or n_out < 3:
+        return x, y
+    edges = np.linspace(1, len(x) - 1, n_out - 1).astype(int)
+    edges = np.r_[edges, len(x)]
+    idx = [0]
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        x_next = np.mean(x[hi:edges[i + 2]])
+        y_next = np.mean(y[hi:edges[i + 2]])
+        area = np.abs((x[idx[-1]] - x_next) * (y[lo:hi] - y[idx[-1]]) -
+                      (x[idx[-1]] - x[lo:hi]) * (y_next - y[idx[-1]]))
+        idx.append(lo + np.argmax(area))
+    idx.append(len(x) - 1)
+    return x[idx], y[idx]
+
+
+def _warn_export_error(path, future):
+    """Reports the error of a background image export as a `RuntimeWarning`, so that a failed export is not silent when the future is never collected.
+
+    Parameters
+    ----------
+    path: str
+        The path of the exported image.
+    future: concurrent.futures.Future
+        The finished export.
+    """
+    if not future.cancelled() and future.exception() is not None:
+        warnings.warn(
+            f'Failed to save the figure to {path}: {future.exception()!r}',
+            RuntimeWarning)
 
 
 class HST:
@@ -21,11 +245,13 @@ class HST:
     oil: {'15w40', '5w30', '10w40'}, optional
         The oil choice from the dictionary of available oils, default '15w40'. Each oil is a dictionary with the following structure: {'visc_kin': float, 'density': float, 'visc_dyn': float, 'bulk': float}. Here 'visc_kin' is the kinematic viscosity of the oil in cSt, 'density' is its density in kg/cub.m, 'visc_dyn' is the dynamic viscosity in Pa s, 'bulk' is the oil bulk modulus in bar. All properties are at 100C.
     engine: {'engine_1', 'engine_2'}, optional
-        The engine choice from the dictionary of engines, default 'engine_1'. Each engine is a dictionary with the following structure: {'speed': list, 'torque': list, 'power': list}. Lists must be of the same length.
+        The engine choice from the dictionary of engines, default 'engine_1'. Each engine is a dictionary with the following structure: {'speed': ndarray, 'torque': ndarray, 'power': ndarray}. Arrays must be of the same length.
     input_gear_ratio: float, optional
         The gear ratio of a gear train connecting the HST with an engine, default 0.75, which corresponds to a reduction gear set.
     max_power_input: int, optional
         The maximum mechanical power in kW the HST is meant to transmit, i.e. to take as an input, default 682 kW.
+    oil_data: DataFrame, optional
+        The oil viscosity and density table indexed by temperature, default None. When given, the oil data is not loaded.
     """
     def __init__(self,
                  displ,
@@ -35,7 +261,9 @@ class HST:
                  oil_temp=100,
                  engine='engine_1',
                  input_gear_ratio=.75,
-                 max_power_input=680):
+                 max_power_input=680,
+                 oil_data=None):
+        self._balances = {}
         self.displ = displ
         self.swash = swash
         self.pistons = pistons
@@ -45,13 +273,87 @@ class HST:
         self.engine = engine
         self.input_gear_ratio = input_gear_ratio
         self.max_power_input = max_power_input
-        self.load_oil()
+        self._fig = None
+        self._fig_key = None
+        self.save_future = None
+        if oil_data is None:
+            self.load_oil()
+        else:
+            self.oil_data = oil_data
+            self._update_oil_props()
+
+    @property
+    def displ(self):
+        """The displacement of an axial-piston machine in cc/rev"""
+        return self._displ
+
+    @displ.setter
+    def displ(self, value):
+        self._displ = value
+        self._sizes_dirty = True
+
+    @property
+    def swash(self):
+        """The max swash angle of the axial piston machine in degrees"""
+        return self._swash
+
+    @swash.setter
+    def swash(self, value):
+        self._swash = value
+        self._sizes_dirty = True
+
+    @property
+    def pistons(self):
+        """The number of piston in a machine"""
+        return self._pistons
+
+    @pistons.setter
+    def pistons(self, value):
+        self._pistons = value
+        self._sizes_dirty = True
+
+    @property
+    def oil_temp(self):
+        """The oil temperature in degrees"""
+        return self._oil_temp
+
+    @oil_temp.setter
+    def oil_temp(self, value):
+        previous, self._oil_temp = getattr(self, '_oil_temp', None), value
+        if hasattr(self, 'oil_data'):
+            try:
+                self._update_oil_props()
+            except ValueError:
+                self._oil_temp = previous
+                raise
+
+    @property
+    def sizes(self):
+        """The basic sizes of the pumping group in metres, see `compute_sizes`. Recomputed with the last used design balances whenever `displ`, `swash` or `pistons` change."""
+        if self._sizes_dirty:
+            self.compute_sizes(**self._balances)
+        return self._sizes
 
     def load_oil(self):
-        """Loads oil data from GitHub repository"""
-        self.oil_data = pd.read_csv(
-            f'https://raw.githubusercontent.com/ivanokhotnikov/effmap/master/oils/SAE%20{self.oil[4:]}.csv',
-            index_col=0)
+        """Loads oil data from GitHub repository, caching it on disk and in memory"""
+        self.oil_data = _fetch_oil(self.oil).copy()
+        self._update_oil_props()
+
+    def _update_oil_props(self):
+        """Caches the oil properties at `oil_temp` as floats, linearly interpolating between the tabulated temperatures: `mu_dyn` in mPa s, `visc_kin` in cSt and `density` in kg/cub.m. Raises ValueError if `oil_temp` is outside the tabulated range."""
+        oil_data = self.oil_data.sort_index()
+        temps = oil_data.index.to_numpy(dtype=float)
+        if not temps[0] <= self.oil_temp <= temps[-1]:
+            raise ValueError(
+                f'Oil temperature {self.oil_temp}C is outside the tabulated range {temps[0]:g}-{temps[-1]:g}C of {self.oil}'
+            )
+        self.mu_dyn = float(
+            np.interp(self.oil_temp, temps, oil_data['Dyn. Viscosity']))
+        self.visc_kin = float(
+            np.interp(self.oil_temp, temps, oil_data['Kin. Viscosity']))
+        self.density = float(
+            np.interp(self.oil_temp, temps, oil_data['Density'])) * 1e3
+        self._mu = self.mu_dyn * 1e-3
 
     def import_oils(self):
         """Imports oil data from https://wiki.anton-paar.com/uk-en/engine-oil/. Saves the oil viscosity and density table to the class attribute self.oil_data according to the predefined HST oil type self.oil.
@@ -61,6 +363,8 @@ class HST:
         if f'{self.oil}.csv' in os.listdir('.\oils'):
             self.oil_data = pd.read_csv(f'.\oils\{self.oil}.csv', index_col=0)
         else:
+            import requests
+            import lxml.html as lh
             url = 'https://wiki.anton-paar.com/uk-en/engine-oil/'
             page = requests.get(url)
             doc = lh.fromstring(page.content)
@@ -95,6 +399,7 @@ class HST:
             df.index.name = index_name = col[0][0]
             df[self.oil].to_csv(os.path.join('oils', f'{self.oil}.csv'))
             self.oil_data = df[self.oil]
+        self._update_oil_props()
 
     def plot_oil(self):
         """Plots the oil physical properties for a temperature range.
@@ -103,6 +408,7 @@ class HST:
         -------
         fig: plotly figure obeject
         """
+        import plotly.graph_objects as go
         fig = go.Figure()
         fig.add_scatter(
             mode='lines+markers',
@@ -169,84 +475,12 @@ class HST:
     def load_engines(self):
         """Loads the dictionary of available engines.
 
-        For each key - engine name, the value is a dictionary with a performance curve and pivot speeds. A performance curve is in a form lists of engine speed in rpm, torque in Nm and power in kW.
+        For each key - engine name, the value is a dictionary with a performance curve and pivot speeds. A performance curve is in a form of arrays of engine speed in rpm, torque in Nm and power in kW.
         """
-        return {
-            'engine_1': {
-                'speed': [
-                    1000, 1100, 1200, 1300, 1400, 1500, 1600, 1700, 1800, 1900,
-                    2000, 2100, 2200, 2300, 2400, 2500, 2600, 2700, 2800, 2900,
-                    3000
-                ],
-                'torque': [
-                    1350, 1450, 1550, 1650, 1800, 1975, 2200, 2450, 2750, 3100,
-                    3100, 3100, 3100, 3022, 2944, 2849, 2757, 2654, 2200, 1800,
-                    0
-                ],
-                'power': [
-                    141.372, 167.028, 194.779, 224.624, 263.894, 310.232,
-                    368.614, 436.158, 518.363, 616.799, 649.262, 681.726,
-                    714.189, 727.865, 739.908, 745.866, 750.652, 750.401,
-                    645.074, 546.637, 0
-                ],
-                'pivot speed':
-                2700
-            },
-            'engine_2': {
-                'speed': [
-                    600, 700, 800, 900, 1000, 1100, 1200, 1300, 1400, 1500,
-                    1600, 1700, 1800, 1900, 2000, 2100, 2200, 2300, 2400
-                ],
-                'torque': [
-                    1000, 1100, 1450, 1750, 2100, 2400, 2600, 2950, 3100, 3300,
-                    3400, 3500, 3400, 3300, 3200, 3000, 2800, 2600, 0
-                ],
-                'power': [
-                    62.8319, 80.634, 121.475, 164.934, 219.911, 276.46,
-                    326.726, 401.6, 454.484, 518.363, 569.675, 623.083,
-                    640.885, 656.593, 670.206, 659.734, 645.074, 626.224, 0
-                ],
-                'pivot speed':
-                2200
-            },
-            'engine_3': {
-                'speed': [
-                    1800, 1900, 2000, 2100, 2200, 2300, 2400, 2500, 2600, 2700,
-                    2800, 2900, 3000, 3100, 3200
-                ],
-                'torque': [
-                    4270, 4458, 4558, 4439, 4350, 4250, 4144, 4033, 3891, 3703,
-                    3459, 3183, 2817, 871
-                ],
-                'power': [
-                    805, 887, 955, 994, 1023, 1048, 1068, 1085, 1098, 1100,
-                    1086, 1050, 1000, 914, 292
-                ],
-                'pivot speed':
-                2700
-            },
-            'engine_4': {
-                'speed': [
-                    1000, 1100, 1200, 1300, 1400, 1500, 1600, 1700, 1800, 1900,
-                    2000, 2100, 2200, 2300, 2400, 2500, 2600, 2700, 2800, 2900,
-                    3000
-                ],
-                'torque': [
-                    1750, 1850, 2000, 2200, 2500, 2850, 3250, 3675, 4125, 4600,
-                    4600, 4600, 4600, 4460, 4320, 4180, 4040, 3890, 3300, 2700,
-                    0
-                ],
-                'power': [
-                    183, 213, 251, 299, 366, 448, 544, 654, 777, 915, 963, 1011,
-                    1059, 1074, 1085, 1094, 1099, 1099, 967, 820, 0
-                ],
-                'pivot speed':
-                2700
-            }
-        }
+        return _ENGINES
 
     def compute_sizes(self, k1=.75, k2=.91, k3=.48, k4=.93, k5=.91):
-        """Defines the basic sizes of the pumping group of an axial piston machine in metres. Updates the `sizes` attribute.
+        """Defines the basic sizes of the pumping group of an axial piston machine in metres. Updates the `sizes` attribute. Called lazily on access to `sizes`, so an explicit call is only needed to change the design balances.
 
         Parameters
         ----------
@@ -254,12 +488,13 @@ class HST:
             Design balances, default k1 = .75, k2 = .91, k3 = .48, k4 = .93, k5 = .91
 
         """
+        self._tan_swash = np.tan(np.radians(self.swash))
+        self._cos_swash = np.cos(np.radians(self.swash))
         dia_piston = (4 * self.displ * 1e-6 * k1 /
-                      (self.pistons**2 * np.tan(np.radians(self.swash))))**(1 /
-                                                                            3)
+                      (self.pistons**2 * self._tan_swash))**(1 / 3)
         area_piston = np.pi * dia_piston**2 / 4
         pcd = self.pistons * dia_piston / (np.pi * k1)
-        stroke = pcd * np.tan(np.radians(self.swash))
+        stroke = pcd * self._tan_swash
         min_engagement = 1.4 * dia_piston
         kidney_area = k3 * area_piston
         kidney_width = 2 * (np.sqrt(dia_piston**2 +
@@ -271,10 +506,11 @@ class HST:
         rad_ext_ext = rad_ext_int + land_width
         rad_int_ext = (pcd - kidney_width) / 2
         rad_int_int = rad_int_ext - land_width
-        area_shoe = k4 * area_piston / np.cos(np.radians(self.swash))
+        area_shoe = k4 * area_piston / self._cos_swash
         rad_ext_shoe = np.pi * pcd * k5 / (2 * self.pistons)
         rad_int_shoe = np.sqrt(rad_ext_shoe**2 - area_shoe / np.pi)
-        self.sizes = {
+        self._balances = dict(k1=k1, k2=k2, k3=k3, k4=k4, k5=k5)
+        self._sizes = {
             'd': dia_piston,
             'Ap': area_piston,
             'D': pcd,
@@ -287,6 +523,17 @@ class HST:
             'rs': rad_int_shoe,
             'Rs': rad_ext_shoe
         }
+        self._log_block_term = 1 / np.log(rad_ext_ext / rad_ext_int) + \
+            1 / np.log(rad_int_ext / rad_int_int)
+        self._inv_log_shoe = 1 / np.log(rad_ext_shoe / rad_int_shoe)
+        # sin(pi i / z) = sin(pi (z - i) / z), so only half of the pistons
+        # are summed, the paired ones with a double weight
+        half = np.arange(self.pistons // 2 + 1)
+        self._piston_leak_geom_sum = np.sum(
+            np.where((half == 0) | (2 * half == self.pistons), 1, 2) /
+            (min_engagement + stroke * np.sin(np.pi * half / self.pistons)))
+        self._n_hi, self._n_lo = (self.pistons + 1) // 2, self.pistons // 2
+        self._sizes_dirty = False
 
     def compute_speed_limit(self, RegModel):
         """Defines the pump speed limit."""
@@ -295,6 +542,30 @@ class HST:
             for i in (-RegModel.test_rmse_, 0, +RegModel.test_rmse_)
         ]
 
+    def _make_eff_kernel(self, A, Bp, Bm, Cp, Cm, D, h1, h2, h3, eccentricity):
+        """Partially evaluates the efficiency model for the current geometry, oil and model coefficients, see `compute_eff` for the arguments.
+
+        Returns
+        -------
+        kernel: function
+            The function kernel(speed_pump, pressure_discharge, pressure_charge) of flat arrays returning the tuple of `_compute_eff_core`.
+        """
+        sizes = self.sizes
+        leak_coef = np.pi * 0.5 / self._mu * (
+            h1**3 * self._log_block_term / 6 +
+            self.pistons * h2**3 * self._inv_log_shoe / 6 +
+            self.pistons * sizes['d'] * h3**3 *
+            (1 + 1.5 * eccentricity**3) * self._piston_leak_geom_sum / 12)
+        params = tuple(
+            float(i) for i in (leak_coef, self.mu_dyn, self.displ, self.swash,
+                               self.oil_bulk, A, Bp, Bm, Cp, Cm, D))
+
+        def kernel(speed_pump, pressure_discharge, pressure_charge):
+            return _compute_eff_kernel(speed_pump, pressure_discharge,
+                                       pressure_charge, *params)
+
+        return kernel
+
     def compute_eff(self,
                     speed_pump,
                     pressure_discharge,
@@ -313,10 +584,10 @@ class HST:
 
         Parameters
         ----------
-        speed_pump: int
-            The HST input, or pump, speed in rpm.
-        pressure_discharge: float
-            The discharge pressures in bar.
+        speed_pump: int or ndarray
+            The HST input, or pump, speed in rpm. Arrays are broadcast against `pressure_discharge`.
+        pressure_discharge: float or ndarray
+            The discharge pressures in bar. Arrays are broadcast against `speed_pump`.
         pressure_charge: float, optional
             The charge pressure in bar, default 25 bar.
         A, Bp, Bm, Cp, Cm, D: float, optional
@@ -334,69 +605,17 @@ class HST:
             'motor': {'volumetric': float, 'mechanical': float, 'total': float},
             'hst': {'volumetric': float, 'mechanical': float, 'total': float}}
         """
-        leak_block = np.pi * h1**3 * 0.5 * (
-            pressure_discharge * 1e5 + pressure_charge * 1e5
-        ) * (1 / np.log(self.sizes['Rbo'] / self.sizes['rbo']) +
-             1 / np.log(self.sizes['Rbi'] / self.sizes['rbi'])) / (
-                 6 * self.oil_data.loc[self.oil_temp]['Dyn. Viscosity'] * 1e-3)
-        leak_shoes = (self.pistons * np.pi * h2**3 * 0.5 *
-                      (pressure_discharge * 1e5 + pressure_charge * 1e5) /
-                      (6 * self.oil_data.loc[self.oil_temp]['Dyn. Viscosity'] *
-                       1e-3 * np.log(self.sizes['Rs'] / self.sizes['rs'])))
-        leak_piston = np.array([
-            self.pistons * np.pi * self.sizes['d'] * h3**3 * 0.5 *
-            (pressure_discharge * 1e5 + pressure_charge * 1e5) *
-            (1 + 1.5 * eccentricity**3) *
-            (1 / (self.sizes['eng'] +
-                  self.sizes['h'] * np.sin(np.pi * (ii) / self.pistons))) /
-            (12 * self.oil_data.loc[self.oil_temp]['Dyn. Viscosity'] * 1e-3)
-            for ii in np.arange(self.pistons)
-        ])
-        leak_pistons = sum(leak_piston)
-        leak_total = sum((leak_block, leak_shoes, leak_pistons))
-        th_flow_rate_pump = speed_pump * self.displ / 6e7
-        vol_pump = (1 -
-                    (pressure_discharge - pressure_charge) / self.oil_bulk -
-                    leak_total / th_flow_rate_pump) * 100
-        vol_motor = (1 - leak_total / th_flow_rate_pump) * 100
-        vol_hst = vol_pump * vol_motor * 1e-2
-        mech_pump = (
-            1 - A * np.exp(
-                -Bp * self.oil_data.loc[self.oil_temp]['Dyn. Viscosity'] *
-                speed_pump /
-                (self.swash *
-                 (pressure_discharge * 1e5 - pressure_charge * 1e5) * 1e-5)) -
-            Cp * np.sqrt(self.oil_data.loc[self.oil_temp]['Dyn. Viscosity'] *
-                         speed_pump /
-                         (self.swash *
-                          (pressure_discharge * 1e5 - pressure_charge * 1e5) *
-                          1e-5)) - D /
-            (self.swash *
-             (pressure_discharge * 1e5 - pressure_charge * 1e5) * 1e-5)) * 100
-        mech_motor = (
-            1 - A * np.exp(
-                -Bm * self.oil_data.loc[self.oil_temp]['Dyn. Viscosity'] *
-                speed_pump * vol_hst * 1e-2 /
-                (self.swash *
-                 (pressure_discharge * 1e5 - pressure_charge * 1e5) * 1e-5)) -
-            Cm * np.sqrt(self.oil_data.loc[self.oil_temp]['Dyn. Viscosity'] *
-                         speed_pump * vol_hst * 1e-2 /
-                         (self.swash *
-                          (pressure_discharge * 1e5 - pressure_charge * 1e5) *
-                          1e-5)) - D /
-            (self.swash *
-             (pressure_discharge * 1e5 - pressure_charge * 1e5) * 1e-5)) * 100
-        mech_hst = mech_pump * mech_motor * 1e-2
-        total_pump = vol_pump * mech_pump * 1e-2
-        total_motor = vol_motor * mech_motor * 1e-2
-        total_hst = total_pump * total_motor * 1e-2
-        torque_pump = (pressure_discharge * 1e5 - pressure_charge * 1e5) * \
-            self.displ * 1e-6 / (2 * np.pi * mech_pump * 1e-2)
-        torque_motor = (pressure_discharge * 1e5 - pressure_charge * 1e5) * self.displ * \
-            1e-6 / (2 * np.pi * mech_pump * 1e-2) * (mech_hst * 1e-2)
-        power_pump = torque_pump * speed_pump * np.pi / 30 * 1e-3
-        power_motor = power_pump * total_hst * 1e-2
-        speed_motor = speed_pump * vol_hst * 1e-2
+        kernel = self._make_eff_kernel(A, Bp, Bm, Cp, Cm, D, h1, h2, h3,
+                                       eccentricity)
+        speed, p_dis, p_chg = np.broadcast_arrays(
+            np.asarray(speed_pump, dtype=float),
+            np.asarray(pressure_discharge, dtype=float),
+            np.asarray(pressure_charge, dtype=float))
+        out = kernel(np.ravel(speed), np.ravel(p_dis), np.ravel(p_chg))
+        (vol_pump, vol_motor, vol_hst, mech_pump, mech_motor, mech_hst,
+         total_pump, total_motor, total_hst, torque_pump, torque_motor,
+         power_pump, power_motor,
+         speed_motor) = (i.reshape(speed.shape)[()] for i in out)
         self.performance = {
             'pump': {
                 'speed': speed_pump,
@@ -445,33 +664,37 @@ class HST:
         pressure_charge: float, optional
             The charge pressure in bar, default 25.0 bar.
         """
-        self.shaft_radial = (np.ceil(self.pistons / 2) * pressure_discharge +
-                             np.floor(self.pistons / 2) * pressure_charge
-                             ) * 1e5 * self.sizes['Ap'] * np.tan(
-                                 np.radians(self.swash)) / 1e3
-        self.swash_hp_x = np.ceil(self.pistons / 2) * \
-            pressure_discharge * 1e5 * self.sizes['Ap'] / 1e3
-        self.swash_lp_x = np.floor(self.pistons / 2) * \
-            pressure_charge * 1e5 * self.sizes['Ap'] / 1e3
-        self.swash_hp_z = self.swash_hp_x * np.tan(np.radians(self.swash))
-        self.swash_lp_z = self.swash_lp_x * np.tan(np.radians(self.swash))
-        self.motor_hp = np.ceil(self.pistons / 2) * pressure_discharge * \
-            1e5 * self.sizes['Ap'] / np.cos(np.radians(self.swash)) / 1e3
-        self.motor_lp = np.floor(self.pistons / 2) * pressure_charge * \
-            1e5 * self.sizes['Ap'] / np.cos(np.radians(self.swash)) / 1e3
+        area_piston = self.sizes['Ap']
+        self.swash_hp_x = self._n_hi * \
+            pressure_discharge * PA_PER_BAR * area_piston / 1e3
+        self.swash_lp_x = self._n_lo * \
+            pressure_charge * PA_PER_BAR * area_piston / 1e3
+        self.shaft_radial = (self.swash_hp_x +
+                             self.swash_lp_x) * self._tan_swash
+        self.swash_hp_z = self.swash_hp_x * self._tan_swash
+        self.swash_lp_z = self.swash_lp_x * self._tan_swash
+        self.motor_hp = self.swash_hp_x / self._cos_swash
+        self.motor_lp = self.swash_lp_x / self._cos_swash
         self.shaft_torque = self.performance['pump']['torque']
 
     def add_no_load(self, *args):
         """Adds class attributes of the no-load test data: tuple self.no_load containing speeds and pressures of possible onset of block tilting, self.no_load_intercept and self.no_load_coef are coefficients of a linear regression model built for the no_load data."""
-        X, Y = np.reshape([], (-1, 1)), np.reshape([], (-1, 1))
+        speeds, pressures = [], []
         for speed, pressure in args:
-            X = np.r_[X, np.reshape(speed, (-1, 1))]
-            Y = np.r_[Y, np.reshape(pressure, (-1, 1))]
-        lin_reg = LinearRegression()
-        lin_reg.fit(X, Y)
+            speeds.append(np.ravel(speed))
+            pressures.append(np.ravel(pressure))
+        X = np.concatenate(speeds).astype(float).reshape(-1, 1)
+        Y = np.concatenate(pressures).astype(float).reshape(-1, 1)
+        x, y, n = X.ravel(), Y.ravel(), len(X)
+        if np.ptp(x) == 0:
+            raise ValueError(
+                'The no-load data must contain at least two distinct speeds')
+        slope = (n * np.sum(x * y) - np.sum(x) * np.sum(y)) / (
+            n * np.sum(x * x) - np.sum(x)**2)
+        intercept = (np.sum(y) - slope * np.sum(x)) / n
         self.no_load_points = (X, Y)
-        self.no_load_intercept = lin_reg.intercept_
-        self.no_load_coef = lin_reg.coef_
+        self.no_load_intercept = np.array([intercept])
+        self.no_load_coef = np.array([[slope]])
 
     def plot_eff_maps(self,
                       max_speed_pump,
@@ -482,7 +705,9 @@ class HST:
                       res=50,
                       show_figure=True,
                       save_figure=False,
-                      format='pdf'):
+                      format='pdf',
+                      redraw_only=False,
+                      render_res=200):
         """Plots and optionally saves the HST efficiency maps.
 
         Parameters
@@ -500,197 +725,231 @@ class HST:
         show_figure: bool, optional
             The flag for saving the figure, default True.
         save_figure: bool, optional
-            The flag for saving the figure, default True.
+            The flag for saving the figure, default True. The figure is written in a background thread, one export at a time, and the `concurrent.futures.Future` of the export is kept in the `save_future` attribute. Export errors, e.g. an unknown format or missing Kaleido, are reported as a `RuntimeWarning` when the export finishes, and are raised again when the result is collected with `save_future.result()`.
         format : str, optional
             The file extension in which the figure will be saved, default 'pdf'.
         in_app: bool, optional
             The flag allowing to show the plots in a browser.
+        redraw_only: bool, optional
+            The flag to update the figure built by the previous call in place instead of building a new figure, default False. Only the data of the traces, the title and the axis ranges are assigned, so the figure object returned by the previous call is mutated and returned again. A new figure is built when the set of traces differs, e.g. after adding or removing the engine or the speed limits.
+        render_res: int, optional
+            The maximum number of samples per axis and per curve sent to the figure, default 200. The samples are evenly spread over the map and always include both ends of each range. The full-resolution map is stored in the `eff_map` attribute.
 
         Returns:
         ---
         fig: plotly figure object
         """
+        import plotly.io as pio
+        import plotly.graph_objects as go
         speed = np.linspace(min_speed_pump, max_speed_pump, res)
         pressure = np.linspace(min_pressure_discharge, max_pressure_discharge,
                                res)
-        eff_hst = np.array([[
-            self.compute_eff(i, j,
-                             pressure_charge=pressure_charge)['hst']['total']
-            for i in speed
-        ] for j in pressure])
-        mech_eff_pump = np.array([[
-            self.compute_eff(
-                i, j, pressure_charge=pressure_charge)['pump']['mechanical']
-            for i in speed
-        ] for j in pressure])
+        eff = self.compute_eff(speed[None, :],
+                               pressure[:, None],
+                               pressure_charge=pressure_charge)
+        eff_hst = eff['hst']['total']
+        mech_eff_pump_max = np.amax(eff['pump']['mechanical'], axis=0)
+        self.eff_map = {'speed': speed, 'pressure': pressure, 'hst': eff_hst}
+        idx = np.unique(
+            np.linspace(0, res - 1, min(res, render_res)).round().astype(int))
+        speed_render, pressure_render = speed[idx], pressure[idx]
+        eff_hst_render = eff_hst[np.ix_(idx, idx)].astype(np.float32)
         torque_pump = self.displ * 1e-6 * \
-            (pressure - pressure_charge) * 1e5 / \
-            (2 * np.pi * np.amax(mech_eff_pump, axis=0) * 1e-2)
-        fig = go.Figure()
-        fig.add_trace(
-            go.Contour(z=eff_hst,
-                       x=speed,
-                       y=pressure,
-                       colorscale='Portland',
-                       showscale=False,
-                       contours_coloring='lines',
-                       name='HST efficiency, %',
-                       contours=dict(coloring='lines',
-                                     start=10,
-                                     end=99,
-                                     size=1,
-                                     showlabels=True,
-                                     labelfont=dict(size=8, color='black'))), )
-        fig.add_scatter(mode='lines',
-                        x=speed,
-                        y=np.reshape(self.no_load_coef, (-1, )) * speed +
-                        np.reshape(self.no_load_intercept, (-1, )),
-                        yaxis='y1',
-                        name='No-load test limit',
-                        line=dict(
-                            width=1,
-                            dash='dash',
-                            color='purple',
-                        ))
-        fig.update_layout(
-            title=
-            f'HST{self.displ} efficiency map and the engine torque curve {self.oil} at {self.oil_temp}C',
-            width=800,
-            height=700,
-            xaxis=dict(
-                title='HST input speed, rpm',
-                showline=True,
-                linecolor='black',
-                mirror=True,
-                showgrid=True,
-                gridcolor='LightGray',
-                gridwidth=0.25,
-                linewidth=0.5,
-            ),
-            yaxis=dict(title='HST discharge pressure, bar',
-                       showline=True,
-                       linecolor='black',
-                       mirror=True,
-                       showgrid=True,
-                       gridcolor='LightGray',
-                       gridwidth=0.25,
-                       linewidth=0.5,
-                       range=[min(pressure), max(pressure)]),
-            plot_bgcolor='rgba(255,255,255,1)',
-            paper_bgcolor='rgba(255,255,255,0)',
-            showlegend=True,
-            legend_orientation='h',
-            legend=dict(x=0, y=-.1))
+            (pressure - pressure_charge) * PA_PER_BAR / \
+            (2 * np.pi * mech_eff_pump_max * 1e-2)
+        no_load_limit = np.reshape(self.no_load_coef, (-1, )) * speed_render + \
+            np.reshape(self.no_load_intercept, (-1, ))
+        speed_ends = [np.amin(speed), np.amax(speed)]
+        pressure_ends = [np.amin(pressure), np.amax(pressure)]
+        title = f'HST{self.displ} efficiency map and the engine torque curve {self.oil} at {self.oil_temp}C'
         if self.engine:
             ENGINES = self.load_engines()
             pressure_pivot = self.max_power_input * 1e3 * 30 / np.pi / \
                 ENGINES[self.engine]['pivot speed'] / self.input_gear_ratio * 2 * np.pi / \
-                self.displ / 1e-6 / 1e5 * \
-                np.amax(mech_eff_pump) * 1e-2 + pressure_charge
+                self.displ / 1e-6 / PA_PER_BAR * \
+                np.amax(mech_eff_pump_max) * 1e-2 + pressure_charge
             _ = self.compute_eff(
                 ENGINES[self.engine]['pivot speed'] * self.input_gear_ratio,
                 pressure_pivot)
             performance_pivot = self.performance
-            fig.add_scatter(
-                x=self.input_gear_ratio *
-                np.asarray(ENGINES[self.engine]['speed']),
-                y=np.asarray(ENGINES[self.engine]['torque']) /
-                self.input_gear_ratio,
-                name='Engine torque',
-                mode='lines+markers',
-                marker=dict(size=3),
-                line=dict(color='indianred', width=1),
-                yaxis='y2',
-            )
-            fig.add_scatter(x=speed,
-                            y=self.max_power_input * 1e3 * 30 /
-                            (np.pi * speed),
-                            name='Torque at max power',
+            engine_speed = self.input_gear_ratio * ENGINES[
+                self.engine]['speed']
+            engine_torque = ENGINES[
+                self.engine]['torque'] / self.input_gear_ratio
+            speed_max_power, torque_max_power = _decimate(
+                speed, self.max_power_input * 1e3 * 30 / (np.pi * speed),
+                render_res)
+            pressures_turn = [
+                i * performance_pivot['discharge pressure']
+                for i in (1, .65, .5)
+            ]
+            speed_pivot = [
+                self.input_gear_ratio * ENGINES[self.engine]['pivot speed']
+            ]
+            torque_pivot = [performance_pivot['pump']['torque']]
+            torque_range = [np.amin(torque_pump), np.amax(torque_pump)]
+        speed_limits = list(self.pump_speed_limit or [])[:3]
+        fig_key = (bool(self.engine), len(speed_limits))
+        if redraw_only and self._fig is not None and self._fig_key == fig_key:
+            fig = self._fig
+            with fig.batch_update():
+                fig.data[0].x = speed_render
+                fig.data[0].y = pressure_render
+                fig.data[0].z = eff_hst_render
+                fig.data[1].x = speed_render
+                fig.data[1].y = no_load_limit
+                fig.layout.title.text = title
+                fig.layout.yaxis.range = pressure_ends
+                n = 2
+                if self.engine:
+                    fig.data[2].x, fig.data[2].y = engine_speed, engine_torque
+                    fig.data[3].x = speed_max_power
+                    fig.data[3].y = torque_max_power
+                    for trace, pressure_turn in zip(fig.data[4:7],
+                                                    pressures_turn):
+                        trace.x = speed_ends
+                        trace.y = [pressure_turn, pressure_turn]
+                    fig.data[7].x, fig.data[7].y = speed_pivot, torque_pivot
+                    fig.layout.xaxis.range = [min_speed_pump, max_speed_pump]
+                    fig.layout.yaxis2.range = torque_range
+                    n = 8
+                for trace, speed_limit in zip(fig.data[n:], speed_limits):
+                    trace.x = [speed_limit, speed_limit]
+                    trace.y = pressure_ends
+        else:
+            traces = [
+                go.Contour(z=eff_hst_render,
+                           x=speed_render,
+                           y=pressure_render,
+                           colorscale='Portland',
+                           showscale=False,
+                           contours_coloring='lines',
+                           name='HST efficiency, %',
+                           contours=dict(coloring='lines',
+                                         start=10,
+                                         end=99,
+                                         size=1,
+                                         showlabels=True,
+                                         labelfont=dict(size=8,
+                                                        color='black'))),
+                go.Scatter(mode='lines',
+                           x=speed_render,
+                           y=no_load_limit,
+                           yaxis='y1',
+                           name='No-load test limit',
+                           line=dict(
+                               width=1,
+                               dash='dash',
+                               color='purple',
+                           ))
+            ]
+            layout = dict(title=title,
+                          width=800,
+                          height=700,
+                          xaxis=dict(
+                              title='HST input speed, rpm',
+                              showline=True,
+                              linecolor='black',
+                              mirror=True,
+                              showgrid=True,
+                              gridcolor='LightGray',
+                              gridwidth=0.25,
+                              linewidth=0.5,
+                          ),
+                          yaxis=dict(title='HST discharge pressure, bar',
+                                     showline=True,
+                                     linecolor='black',
+                                     mirror=True,
+                                     showgrid=True,
+                                     gridcolor='LightGray',
+                                     gridwidth=0.25,
+                                     linewidth=0.5,
+                                     range=pressure_ends),
+                          plot_bgcolor='rgba(255,255,255,1)',
+                          paper_bgcolor='rgba(255,255,255,0)',
+                          showlegend=True,
+                          legend_orientation='h',
+                          legend=dict(x=0, y=-.1))
+            if self.engine:
+                traces += [
+                    go.Scatter(
+                        x=engine_speed,
+                        y=engine_torque,
+                        name='Engine torque',
+                        mode='lines+markers',
+                        marker=dict(size=3),
+                        line=dict(color='indianred', width=1),
+                        yaxis='y2',
+                    ),
+                    go.Scatter(x=speed_max_power,
+                               y=torque_max_power,
+                               name='Torque at max power',
+                               mode='lines',
+                               line=dict(color='steelblue', width=1),
+                               yaxis='y2')
+                ]
+                for i in zip(
+                        pressures_turn,
+                    ('Pressure at pivot turn', 'Pressure at tight turn',
+                     'Pressure at cornering'), ('red', 'orange', 'green')):
+                    traces.append(
+                        go.Scatter(
+                            x=speed_ends,
+                            y=[i[0], i[0]],
                             mode='lines',
-                            line=dict(color='steelblue', width=1),
-                            yaxis='y2')
-            fig.add_scatter(
-                x=[np.amin(speed), np.amax(speed)],
-                y=[
-                    performance_pivot['discharge pressure'],
-                    performance_pivot['discharge pressure']
-                ],
-                mode='lines',
-                name='Pressure at pivot turn',
-                line=dict(color='red', dash='dot', width=1),
-                yaxis='y1',
-            )
-            fig.add_scatter(
-                x=[np.amin(speed), np.amax(speed)],
-                y=[
-                    .65 * performance_pivot['discharge pressure'],
-                    .65 * performance_pivot['discharge pressure']
-                ],
-                mode='lines',
-                name='Pressure at tight turn',
-                line=dict(color='orange', dash='dot', width=1),
-                yaxis='y1',
-            )
-            fig.add_scatter(
-                x=[np.amin(speed), np.amax(speed)],
-                y=[
-                    .5 * performance_pivot['discharge pressure'],
-                    .5 * performance_pivot['discharge pressure']
-                ],
-                mode='lines',
-                name='Pressure at cornering',
-                line=dict(color='green', dash='dot', width=1),
-                yaxis='y1',
-            )
-            fig.update_layout(
-                xaxis=dict(
+                            name=i[1],
+                            line=dict(color=i[2], dash='dot', width=1),
+                            yaxis='y1',
+                        ))
+                traces.append(
+                    go.Scatter(x=speed_pivot,
+                               y=torque_pivot,
+                               name='Pivot turn',
+                               mode='markers',
+                               marker=dict(
+                                   color='steelblue',
+                                   size=7,
+                                   line=dict(color='navy', width=1),
+                               ),
+                               yaxis='y2'))
+                layout['xaxis'].update(
                     dtick=200,
                     range=[min_speed_pump, max_speed_pump],
-                ),
-                yaxis2=dict(
+                )
+                layout['yaxis2'] = dict(
                     title='HST input torque, Nm',
-                    range=[np.amin(torque_pump),
-                           np.amax(torque_pump)],
+                    range=torque_range,
                     overlaying='y',
                     side='right',
                     showline=True,
                     linecolor='black',
-                ),
-                yaxis=dict(range=[np.amin(pressure),
-                                  np.amax(pressure)]),
-            )
-            fig.add_scatter(x=[
-                self.input_gear_ratio * ENGINES[self.engine]['pivot speed']
-            ],
-                            y=[performance_pivot['pump']['torque']],
-                            name='Pivot turn',
-                            mode='markers',
-                            marker=dict(
-                                color='steelblue',
-                                size=7,
-                                line=dict(color='navy', width=1),
-                            ),
-                            yaxis='y2')
-        if self.pump_speed_limit:
-            for i in zip(self.pump_speed_limit,
+                )
+            for i in zip(speed_limits,
                          ('Min rated speed', 'Rated speed', 'Max rated speed'),
                          ('green', 'orange', 'red')):
-                fig.add_scatter(
-                    x=[i[0], i[0]],
-                    y=[np.amin(pressure), np.amax(pressure)],
-                    mode='lines',
-                    name=i[1],
-                    line=dict(
-                        dash='dash',
-                        width=1,
-                        color=i[2],
-                    ),
-                    yaxis='y1',
-                )
+                traces.append(
+                    go.Scatter(
+                        x=[i[0], i[0]],
+                        y=pressure_ends,
+                        mode='lines',
+                        name=i[1],
+                        line=dict(
+                            dash='dash',
+                            width=1,
+                            color=i[2],
+                        ),
+                        yaxis='y1',
+                    ))
+            fig = go.Figure(data=traces, layout=go.Layout(layout))
+            self._fig, self._fig_key = fig, fig_key
         if save_figure:
             if not os.path.exists('images'):
                 os.mkdir('images')
-            fig.write_image(f'images/eff_map_{self.displ}.{format}')
+            path = f'images/eff_map_{self.displ}.{format}'
+            self.save_future = _image_exporter.submit(pio.write_image,
+                                                      fig.to_dict(), path)
+            self.save_future.add_done_callback(
+                functools.partial(_warn_export_error, path))
         if show_figure:
             fig.show()
         return fig